@@ -3,6 +3,11 @@ import os
 import re
 from typing import Dict, List
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def _narration_lines(script_text: str) -> List[str]:
     lines = [line.strip() for line in script_text.splitlines() if line.strip()]
@@ -52,8 +57,12 @@ def generate_seo_metadata(topic: str, script_text: str, output_path: str = "outp
         "privacyStatus": os.getenv("YOUTUBE_PRIVACY_STATUS", "private"),
     }
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        with open(output_path, "wb") as f:
+            f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
 
     txt_path = output_path.replace(".json", ".txt")
     with open(txt_path, "w", encoding="utf-8") as f:
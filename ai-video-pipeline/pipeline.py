@@ -2,6 +2,7 @@ import json
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from metadata_generator import generate_seo_metadata
 from script_generator import extract_visuals_and_narration, generate_script
@@ -12,6 +13,16 @@ from visual_fetcher import fetch_visuals
 from voice_generator import generate_voiceover_sync
 from youtube_uploader import upload_video_to_youtube
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _write_text(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
 
 def run_pipeline(topic):
     """Complete end-to-end AI video generation pipeline."""
@@ -35,40 +46,52 @@ def run_pipeline(topic):
     visuals, narration = extract_visuals_and_narration(script, topic)
     print(f"   Generated {len(visuals)} visuals and {len(narration)} narration lines")
 
-    with open("outputs/script.txt", "w", encoding="utf-8") as f:
-        f.write(script)
-    print("   Script saved to outputs/script.txt")
+    expected_visuals = int(os.getenv("MAX_VISUAL_DOWNLOADS", "8"))
 
-    print("\nSTEP 2/8: Creating voiceover...")
-    audio_file = generate_voiceover_sync(script, "outputs/voiceover.mp3")
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        script_future = executor.submit(_write_text, "outputs/script.txt", script)
 
-    expected_visuals = int(os.getenv("MAX_VISUAL_DOWNLOADS", "8"))
+        # Voiceover, thumbnail and metadata only need the script, so they run in the
+        # background. Visual downloads stay on the main thread so Ctrl-C still stops
+        # them and the pipeline continues with the clips fetched so far.
+        print("\nSTEP 2/8: Creating voiceover...")
+        voiceover_future = executor.submit(generate_voiceover_sync, script, "outputs/voiceover.mp3")
+        thumbnail_future = executor.submit(create_thumbnail, topic, "outputs/thumbnail.jpg")
+        metadata_future = executor.submit(generate_seo_metadata, topic, script, "outputs/metadata.json")
 
-    print("\nSTEP 3/8: Downloading visuals...")
-    video_files = fetch_visuals(script, "visuals")
-    print(f"   Downloaded {len(video_files)} videos")
+        print("\nSTEP 3/8: Downloading visuals...")
+        video_files = fetch_visuals(script, "visuals")
+        print(f"   Downloaded {len(video_files)} videos")
 
-    print("\nSTEP 4/8: Assembling video...")
-    output_filename = f"outputs/{topic.replace(' ', '_')}_final.mp4"
-    final_video = create_video(
-        video_files,
-        audio_file,
-        output_filename,
-        target_duration=target_duration,
-        expected_clips=expected_visuals,
-    )
+        audio_file = voiceover_future.result()
+        subtitles_future = executor.submit(
+            generate_subtitles, script, audio_file, "outputs/subtitles.srt", "outputs/subtitles.vtt"
+        )
 
-    print("\nSTEP 5/8: Generating thumbnail...")
-    thumbnail_file = create_thumbnail(topic, "outputs/thumbnail.jpg")
-    print(f"   Thumbnail: {thumbnail_file}")
+        print("\nSTEP 4/8: Assembling video...")
+        output_filename = f"outputs/{topic.replace(' ', '_')}_final.mp4"
+        final_video = create_video(
+            video_files,
+            audio_file,
+            output_filename,
+            target_duration=target_duration,
+            expected_clips=expected_visuals,
+        )
+
+        print("\nSTEP 5/8: Generating thumbnail...")
+        thumbnail_file = thumbnail_future.result()
+        print(f"   Thumbnail: {thumbnail_file}")
+
+        print("\nSTEP 6/8: Generating SEO metadata...")
+        metadata = metadata_future.result()
+        print("   Metadata: outputs/metadata.json")
 
-    print("\nSTEP 6/8: Generating SEO metadata...")
-    metadata = generate_seo_metadata(topic, script, "outputs/metadata.json")
-    print("   Metadata: outputs/metadata.json")
+        print("\nSTEP 7/8: Generating subtitles...")
+        srt_file, vtt_file = subtitles_future.result()
+        print(f"   Subtitles: {srt_file}, {vtt_file}")
 
-    print("\nSTEP 7/8: Generating subtitles...")
-    srt_file, vtt_file = generate_subtitles(script, audio_file, "outputs/subtitles.srt", "outputs/subtitles.vtt")
-    print(f"   Subtitles: {srt_file}, {vtt_file}")
+        script_future.result()
+        print("   Script saved to outputs/script.txt")
 
     youtube_url = None
     if os.getenv("ENABLE_YOUTUBE_UPLOAD", "0") == "1":
@@ -85,22 +108,23 @@ def run_pipeline(topic):
 
     total_time = time.time() - start_time
 
-    with open("outputs/pipeline_summary.json", "w", encoding="utf-8") as f:
-        json.dump(
-            {
-                "topic": topic,
-                "video": final_video,
-                "script": "outputs/script.txt",
-                "voiceover": audio_file,
-                "thumbnail": thumbnail_file,
-                "metadata": "outputs/metadata.json",
-                "subtitles": {"srt": srt_file, "vtt": vtt_file},
-                "youtube_url": youtube_url,
-                "runtime_seconds": round(total_time, 2),
-            },
-            f,
-            indent=2,
-        )
+    summary = {
+        "topic": topic,
+        "video": final_video,
+        "script": "outputs/script.txt",
+        "voiceover": audio_file,
+        "thumbnail": thumbnail_file,
+        "metadata": "outputs/metadata.json",
+        "subtitles": {"srt": srt_file, "vtt": vtt_file},
+        "youtube_url": youtube_url,
+        "runtime_seconds": round(total_time, 2),
+    }
+    if orjson is not None:
+        with open("outputs/pipeline_summary.json", "wb") as f:
+            f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+    else:
+        with open("outputs/pipeline_summary.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
 
     print("\n" + "=" * 60)
     print("PIPELINE COMPLETE")
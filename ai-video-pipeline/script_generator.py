@@ -1,6 +1,10 @@
+import functools
+import hashlib
+import json
 import os
 import re
-from typing import List, Tuple
+import time
+from typing import List, Optional, Tuple
 
 import google.generativeai as genai
 from dotenv import load_dotenv
@@ -14,6 +18,20 @@ if not GEMINI_API_KEY:
 
 genai.configure(api_key=GEMINI_API_KEY)
 
+ENABLE_SCRIPT_CACHE = os.getenv("ENABLE_SCRIPT_CACHE", "1") == "1"
+SCRIPT_CACHE_DIR = os.getenv(
+    "SCRIPT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ai-video-pipeline", "scripts")
+)
+MODEL_LIST_TTL_SECONDS = int(os.getenv("MODEL_LIST_TTL_SECONDS", "3600"))
+
+ALLOW_SEMANTIC_CACHE = os.getenv("ALLOW_SEMANTIC_CACHE", "0") == "1"
+SEMANTIC_CACHE_MODEL = os.getenv("SEMANTIC_CACHE_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+
+_LABEL_RE_1 = re.compile(r"^(narration|scene|line)\s*(\d+)?\s*[:\-]\s*", re.IGNORECASE)
+_LABEL_RE_2 = re.compile(r"^(narration|scene|line)\s+(\d+)\.?\s*", re.IGNORECASE)
+_NUM_RE = re.compile(r"^\d+\s*[:\-]\s*")
+
 
 def _is_allowed_model(name: str) -> bool:
     n = name.lower()
@@ -21,9 +39,29 @@ def _is_allowed_model(name: str) -> bool:
     return not any(x in n for x in blocked)
 
 
-def _get_model_order() -> List[str]:
-    preferred = os.getenv("GEMINI_MODEL", "").strip()
-    available: List[str] = []
+def _read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _write_json(path: str, data: dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+    except Exception:
+        pass
+
+
+def _list_available_models() -> List[str]:
+    cache_path = os.path.join(SCRIPT_CACHE_DIR, "_models.json")
+    if ENABLE_SCRIPT_CACHE:
+        cached = _read_json(cache_path)
+        if cached and time.time() - cached.get("created", 0) < MODEL_LIST_TTL_SECONDS:
+            return cached.get("models", [])
 
     try:
         available = sorted(
@@ -34,7 +72,89 @@ def _get_model_order() -> List[str]:
             }
         )
     except Exception:
-        available = []
+        return []
+
+    if ENABLE_SCRIPT_CACHE:
+        _write_json(cache_path, {"created": time.time(), "models": available})
+    return available
+
+
+def _script_cache_path(model_name: str, prompt: str) -> str:
+    key = hashlib.sha256((model_name + "|" + prompt).encode("utf-8")).hexdigest()
+    return os.path.join(SCRIPT_CACHE_DIR, f"{key}.json")
+
+
+@functools.lru_cache(maxsize=1)
+def _load_embedder():
+    try:
+        from sentence_transformers import SentenceTransformer
+    except Exception as exc:
+        print(f"Semantic script cache disabled, sentence-transformers missing: {exc}")
+        return None
+    return SentenceTransformer(SEMANTIC_CACHE_MODEL)
+
+
+def _embed_topic(topic: str):
+    embedder = _load_embedder()
+    if embedder is None:
+        return None
+    return embedder.encode(topic.strip().lower(), normalize_embeddings=True)
+
+
+def _semantic_index_path() -> str:
+    return os.path.join(SCRIPT_CACHE_DIR, "_semantic_index.json")
+
+
+def _load_semantic_index() -> Optional[dict]:
+    # Vectors from another embedding model are incomparable (and may differ in length).
+    index = _read_json(_semantic_index_path())
+    if not index or index.get("model") != SEMANTIC_CACHE_MODEL:
+        return None
+    return index
+
+
+def _semantic_lookup(topic: str) -> Optional[str]:
+    """Return a cached script whose topic embedding is close enough to this one."""
+    index = _load_semantic_index()
+    if not index or not index.get("entries"):
+        return None
+    query = _embed_topic(topic)
+    if query is None:
+        return None
+
+    import numpy as np
+
+    entries = [e for e in index["entries"] if len(e.get("vector", ())) == len(query)]
+    if not entries:
+        return None
+    vectors = np.asarray([e["vector"] for e in entries], dtype=np.float32)
+    similarities = vectors @ query
+    best = int(np.argmax(similarities))
+    if similarities[best] < SEMANTIC_CACHE_THRESHOLD:
+        return None
+    cached = _read_json(entries[best]["path"])
+    if not cached or not cached.get("text"):
+        return None
+    print(f"Reusing cached script for similar topic: {entries[best]['topic']}")
+    return cached["text"]
+
+
+def _semantic_store(topic: str, script_path: str) -> None:
+    vector = _embed_topic(topic)
+    if vector is None:
+        return
+    index = _load_semantic_index() or {"model": SEMANTIC_CACHE_MODEL, "entries": []}
+    entries = [
+        e for e in index["entries"] if e.get("path") != script_path and len(e.get("vector", ())) == len(vector)
+    ]
+    entries.append({"topic": topic, "path": script_path, "vector": [float(x) for x in vector]})
+    index["entries"] = entries
+    _write_json(_semantic_index_path(), index)
+
+
+def _get_model_order() -> List[str]:
+    preferred = os.getenv("GEMINI_MODEL", "").strip()
+    available = _list_available_models()
 
     order: List[str] = []
     if preferred:
@@ -92,15 +212,32 @@ A natural spoken sentence for scene 1.
 A natural spoken sentence for scene 8.
 """
 
+    model_order = [m for m in _get_model_order() if _is_allowed_model(m)]
+
+    if ENABLE_SCRIPT_CACHE:
+        for model_name in model_order:
+            cached = _read_json(_script_cache_path(model_name, prompt))
+            if cached and cached.get("text"):
+                return _sanitize_script_text(cached["text"])
+
+    use_semantic = ENABLE_SCRIPT_CACHE and ALLOW_SEMANTIC_CACHE
+    if use_semantic:
+        similar = _semantic_lookup(topic)
+        if similar:
+            return _sanitize_script_text(similar)
+
     saw_quota = False
-    for model_name in _get_model_order():
-        if not _is_allowed_model(model_name):
-            continue
+    for model_name in model_order:
         try:
             model = genai.GenerativeModel(model_name)
             response = model.generate_content(prompt)
             text = (response.text or "").strip()
             if text:
+                if ENABLE_SCRIPT_CACHE:
+                    cache_path = _script_cache_path(model_name, prompt)
+                    _write_json(cache_path, {"model": model_name, "created": time.time(), "text": text})
+                    if use_semantic:
+                        _semantic_store(topic, cache_path)
                 return _sanitize_script_text(text)
         except google_exceptions.NotFound:
             continue
@@ -125,9 +262,9 @@ def _sanitize_script_text(script_text: str) -> str:
         if not line:
             continue
         # Strip labels like "Narration:", "Narration 1:", "Scene 2 -", "Line 3:"
-        line = re.sub(r"^(narration|scene|line)\s*(\d+)?\s*[:\-]\s*", "", line, flags=re.IGNORECASE)
-        line = re.sub(r"^(narration|scene|line)\s+(\d+)\.?\s*", "", line, flags=re.IGNORECASE)
-        line = re.sub(r"^\d+\s*[:\-]\s*", "", line)
+        line = _LABEL_RE_1.sub("", line)
+        line = _LABEL_RE_2.sub("", line)
+        line = _NUM_RE.sub("", line)
         cleaned_lines.append(line)
     return "\n".join(cleaned_lines)
 
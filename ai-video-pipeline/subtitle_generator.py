@@ -1,10 +1,17 @@
+import functools
 import os
 import re
 import shutil
 import subprocess
 from typing import List, Tuple
 
+import numpy as np
 
+
+_LABEL_RE = re.compile(r"^(narration|scene|line)\s*(\d+)?\s*[:\-]\s*", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1)
 def _resolve_ffprobe_bin() -> str | None:
     probe = shutil.which("ffprobe")
     if probe:
@@ -52,7 +59,7 @@ def _lines(script_text: str) -> List[str]:
 
 
 def _clean(line: str) -> str:
-    line = re.sub(r"^(narration|scene|line)\s*(\d+)?\s*[:\-]\s*", "", line, flags=re.IGNORECASE)
+    line = _LABEL_RE.sub("", line)
     return line.strip()
 
 
@@ -80,21 +87,11 @@ def generate_subtitles(
         narration = ["No narration text available."]
 
     duration = _audio_duration(audio_file)
-    weights = [max(1, len(line)) for line in narration]
-    total_weight = sum(weights)
-
-    segments = []
-    t = 0.0
-    for line, w in zip(narration, weights):
-        seg = duration * (w / total_weight)
-        start = t
-        end = min(duration, t + seg)
-        segments.append((start, end, line))
-        t = end
-
-    if segments:
-        start, _, text = segments[-1]
-        segments[-1] = (start, duration, text)
+    weights = np.maximum(1, np.fromiter((len(line) for line in narration), dtype=np.int64, count=len(narration)))
+    ends = np.minimum(duration, np.cumsum(weights) / weights.sum() * duration)
+    ends[-1] = duration
+    starts = np.concatenate(([0.0], ends[:-1]))
+    segments = list(zip(starts.tolist(), ends.tolist(), narration))
 
     with open(srt_path, "w", encoding="utf-8") as srt:
         for i, (start, end, text) in enumerate(segments, start=1):
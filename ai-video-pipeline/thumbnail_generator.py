@@ -1,27 +1,144 @@
+import functools
 import os
+import shutil
+import subprocess
+import tempfile
 from textwrap import wrap
+from typing import Optional
 
 from PIL import Image, ImageDraw, ImageFont
 
+# Opt-in: the ffmpeg renderer spawns a process per thumbnail and is slower than Pillow.
+ENABLE_FFMPEG_THUMBNAIL = os.getenv("ENABLE_FFMPEG_THUMBNAIL", "0") == "1"
 
-def _load_font(size: int):
-    candidates = [
-        "arialbd.ttf",
-        "arial.ttf",
-        "C:/Windows/Fonts/arialbd.ttf",
-        "C:/Windows/Fonts/arial.ttf",
-    ]
-    for candidate in candidates:
+# Bare names rely on Pillow's font lookup; the absolute paths cover Linux/macOS.
+FONT_CANDIDATES = [
+    "arialbd.ttf",
+    "arial.ttf",
+    "C:/Windows/Fonts/arialbd.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    "/Library/Fonts/Arial Bold.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+]
+
+# Pillow's top-right accent ellipse (#1f4ea3, bbox 900,-120..1400,380), drawn per pixel with geq.
+_ACCENT_INSIDE = "lte(hypot(X-1150,Y-130),250)"
+ACCENT_FILTER = (
+    f"geq=r='if({_ACCENT_INSIDE},31,r(X,Y))'"
+    f":g='if({_ACCENT_INSIDE},78,g(X,Y))'"
+    f":b='if({_ACCENT_INSIDE},163,b(X,Y))'"
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_ffmpeg_bin() -> Optional[str]:
+    ff = shutil.which("ffmpeg")
+    if ff:
+        return ff
+    try:
+        from imageio_ffmpeg import get_ffmpeg_exe
+
+        return get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_font_path() -> Optional[str]:
+    for candidate in FONT_CANDIDATES:
         try:
-            return ImageFont.truetype(candidate, size)
+            # .path is the file Pillow actually opened, so drawtext gets the same typeface.
+            return ImageFont.truetype(candidate, 12).path
         except Exception:
             continue
-    return ImageFont.load_default()
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_font(size: int):
+    font_path = _resolve_font_path()
+    if font_path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(font_path, size)
+
+
+def _filter_path(path: str) -> str:
+    # Forward slashes plus an escaped drive colon survive both filtergraph and option parsing.
+    return path.replace("\\", "/").replace(":", "\\:")
+
+
+def _drawtext(textfile: str, x: int, y: int, size: int, color: str, fontfile: Optional[str]) -> str:
+    # Text is read from a file so titles keep punctuation and non-ASCII characters verbatim.
+    font = f"fontfile='{_filter_path(fontfile)}':" if fontfile else ""
+    return (
+        f"drawtext={font}textfile='{_filter_path(textfile)}':expansion=none"
+        f":x={x}:y={y}:fontsize={size}:fontcolor={color}"
+    )
+
+
+def _create_thumbnail_ffmpeg(topic: str, output_path: str) -> bool:
+    ffmpeg_bin = _resolve_ffmpeg_bin()
+    if not ffmpeg_bin:
+        return False
+
+    width, height = 1280, 720
+    fontfile = _resolve_font_path()
+    texts = [("AI EXPLAINED", 70, 70, 56, "white")]
+    y = 180
+    for line in wrap(topic.strip().title(), width=24)[:4]:
+        texts.append((line, 70, y, 72, "0xffda57"))
+        y += 86
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        text_filters = []
+        for i, (text, x, ty, size, color) in enumerate(texts):
+            textfile = os.path.join(tmp_dir, f"text_{i}.txt")
+            with open(textfile, "w", encoding="utf-8") as f:
+                f.write(text)
+            text_filters.append(_drawtext(textfile, x, ty, size, color, fontfile))
+        cta_file = os.path.join(tmp_dir, "cta.txt")
+        with open(cta_file, "w", encoding="utf-8") as f:
+            f.write("WATCH NOW")
+
+        filters = [
+            f"drawbox=x=0:y=0:w={width}:h={height // 2}:color=0x102d66:t=fill",
+            f"drawbox=x=0:y={height // 2}:w={width}:h={height - height // 2}:color=0x061633:t=fill",
+            ACCENT_FILTER,
+            *text_filters,
+            f"drawbox=x=70:y={height - 120}:w=450:h=60:color=0xf04f4f:t=fill",
+            _drawtext(cta_file, 92, height - 113, 42, "white", fontfile),
+        ]
+
+        r = subprocess.run(
+            [
+                ffmpeg_bin,
+                "-f",
+                "lavfi",
+                "-i",
+                f"color=c=0x0a1f44:s={width}x{height}:d=1",
+                "-vf",
+                ",".join(filters),
+                "-frames:v",
+                "1",
+                "-q:v",
+                "2",
+                "-y",
+                output_path,
+            ],
+            capture_output=True,
+            text=True,
+        )
+    return r.returncode == 0 and os.path.exists(output_path)
 
 
 def create_thumbnail(topic: str, output_path: str = "outputs/thumbnail.jpg") -> str:
     os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
 
+    if ENABLE_FFMPEG_THUMBNAIL and _create_thumbnail_ffmpeg(topic, output_path):
+        return output_path
+
     width, height = 1280, 720
     img = Image.new("RGB", (width, height), "#0a1f44")
     draw = ImageDraw.Draw(img)
@@ -1,14 +1,12 @@
+import asyncio
+import functools
 import os
 import shutil
 import subprocess
 from typing import Optional
 
-from PIL import Image
-
-if not hasattr(Image, "ANTIALIAS") and hasattr(Image, "Resampling"):
-    Image.ANTIALIAS = Image.Resampling.LANCZOS
-
 
+@functools.lru_cache(maxsize=1)
 def _resolve_ffmpeg_bin() -> Optional[str]:
     ff = shutil.which("ffmpeg")
     if ff:
@@ -21,6 +19,7 @@ def _resolve_ffmpeg_bin() -> Optional[str]:
         return None
 
 
+@functools.lru_cache(maxsize=None)
 def _resolve_ffprobe_bin(ffmpeg_bin: Optional[str]) -> Optional[str]:
     probe = shutil.which("ffprobe")
     if probe:
@@ -32,250 +31,372 @@ def _resolve_ffprobe_bin(ffmpeg_bin: Optional[str]) -> Optional[str]:
     return None
 
 
-def get_video_duration(video_path: str) -> float:
-    ffmpeg_bin = _resolve_ffmpeg_bin()
-    ffprobe_bin = _resolve_ffprobe_bin(ffmpeg_bin)
-    if not ffprobe_bin:
-        return 0.0
+def _run(cmd: list[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(cmd, capture_output=True, text=True)
 
-    result = subprocess.run(
-        [
-            ffprobe_bin,
-            "-v",
-            "error",
-            "-show_entries",
-            "format=duration",
-            "-of",
-            "default=noprint_wrappers=1:nokey=1",
-            video_path,
-        ],
-        capture_output=True,
-        text=True,
+
+async def _run_async(cmd: list[str]) -> subprocess.CompletedProcess:
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    out, err = await proc.communicate()
+    return subprocess.CompletedProcess(
+        cmd, proc.returncode, out.decode("utf-8", errors="replace"), err.decode("utf-8", errors="replace")
     )
+
+
+async def _gather_limited(limit: int, coros: list) -> list:
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _guarded(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(_guarded(c) for c in coros))
+
+
+def _duration_cmd(ffprobe_bin: str, path: str) -> list[str]:
+    return [
+        ffprobe_bin,
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "default=noprint_wrappers=1:nokey=1",
+        path,
+    ]
+
+
+def _parse_duration(result: subprocess.CompletedProcess) -> float:
     try:
         return float(result.stdout.strip())
     except Exception:
         return 0.0
 
 
+def get_video_duration(video_path: str) -> float:
+    ffprobe_bin = _resolve_ffprobe_bin(_resolve_ffmpeg_bin())
+    if not ffprobe_bin:
+        return 0.0
+    return _parse_duration(_run(_duration_cmd(ffprobe_bin, video_path)))
+
+
 def get_media_duration(path: str) -> float:
-    ffmpeg_bin = _resolve_ffmpeg_bin()
-    ffprobe_bin = _resolve_ffprobe_bin(ffmpeg_bin)
-    if not ffprobe_bin or not os.path.exists(path):
+    if not os.path.exists(path):
         return 0.0
-    result = subprocess.run(
-        [
-            ffprobe_bin,
-            "-v",
-            "error",
-            "-show_entries",
-            "format=duration",
-            "-of",
-            "default=noprint_wrappers=1:nokey=1",
-            path,
-        ],
-        capture_output=True,
-        text=True,
-    )
-    try:
-        return float(result.stdout.strip())
-    except Exception:
+    return get_video_duration(path)
+
+
+async def _probe_duration_async(path: str) -> float:
+    ffprobe_bin = _resolve_ffprobe_bin(_resolve_ffmpeg_bin())
+    if not ffprobe_bin:
         return 0.0
+    return _parse_duration(await _run_async(_duration_cmd(ffprobe_bin, path)))
 
 
-def _run(cmd: list[str]) -> subprocess.CompletedProcess:
-    return subprocess.run(cmd, capture_output=True, text=True)
+async def _probe_durations_async(paths: list[str]) -> dict[str, float]:
+    # ffprobe takes one input per process; overlap the launches instead of paying them serially.
+    unique = list(dict.fromkeys(paths))
+    durations = await asyncio.gather(*(_probe_duration_async(p) for p in unique))
+    return dict(zip(unique, durations))
 
 
-def ensure_exact_duration(video_path: str, target_duration: float, ffmpeg_bin: str) -> str:
-    duration = get_video_duration(video_path)
-    if duration > 0 and abs(duration - target_duration) < 0.1:
-        return video_path
+ENABLE_HW_ENCODER = os.getenv("ENABLE_HW_ENCODER", "1") == "1"
+
+X264_PRESET = "veryfast"
+_THREADS = str(os.cpu_count() or 4)
+# Global options: let the (complex) filter graphs run multi-threaded as well as x264.
+FFMPEG_THREAD_ARGS = ["-filter_threads", _THREADS, "-filter_complex_threads", _THREADS]
+VIDEO_FILTER = "scale=1280:720:force_original_aspect_ratio=decrease,pad=1280:720:(ow-iw)/2:(oh-ih)/2,fps=24,format=yuv420p"
+# Windows caps a command line at 32767 characters; stay well below it.
+MAX_COMMAND_CHARS = 30000
+
+
+# Consumer GPUs cap concurrent NVENC/QSV sessions, so hardware encodes run only this many at once.
+HW_ENCODER_MAX_SESSIONS = 2
+
+
+def _encode_workers(job_count: int, ffmpeg_bin: str) -> int:
+    # Each job is a separate ffmpeg process, so threads only wait on subprocesses.
+    cap = HW_ENCODER_MAX_SESSIONS if _active_hw_encoder(ffmpeg_bin) else 8
+    return max(1, min(job_count, os.cpu_count() or 1, cap))
+
+
+HW_ENCODER_ARGS = {
+    "h264_nvenc": ["-preset", "p4", "-b:v", "4M"],
+    "h264_qsv": ["-preset", "veryfast", "-b:v", "4M"],
+    "h264_videotoolbox": ["-b:v", "4M"],
+    "h264_amf": ["-quality", "speed", "-b:v", "4M"],
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_hw_encoder(ffmpeg_bin: str) -> Optional[str]:
+    r = _run([ffmpeg_bin, "-hide_banner", "-encoders"])
+    if r.returncode != 0:
+        return None
+    for encoder in HW_ENCODER_ARGS:
+        if encoder not in r.stdout:
+            continue
+        # Builds list encoders even without the matching device; confirm with a tiny test encode.
+        probe = _run(
+            [ffmpeg_bin, "-hide_banner", "-f", "lavfi", "-i", "color=s=256x256:d=0.1", "-c:v", encoder, "-f", "null", "-"]
+        )
+        if probe.returncode == 0:
+            return encoder
+    return None
+
+
+SOFTWARE_ENCODER_ARGS = ["-c:v", "libx264", "-preset", X264_PRESET, "-crf", "23", "-threads", "0"]
+
+
+# Set once libx264 succeeds where the hardware encoder failed; later encodes skip the GPU.
+_HW_ENCODER_FAILED = False
+
+
+def _active_hw_encoder(ffmpeg_bin: str) -> Optional[str]:
+    if not ENABLE_HW_ENCODER or _HW_ENCODER_FAILED:
+        return None
+    return _detect_hw_encoder(ffmpeg_bin)
+
+
+def _video_encoder_args(ffmpeg_bin: str) -> list[str]:
+    encoder = _active_hw_encoder(ffmpeg_bin)
+    if encoder:
+        return ["-c:v", encoder, *HW_ENCODER_ARGS[encoder], "-threads", "0"]
+    return SOFTWARE_ENCODER_ARGS
+
+
+def _encode_cmds(ffmpeg_bin: str, before: list[str], after: list[str]) -> list[list[str]]:
+    cmds = [[*before, *_video_encoder_args(ffmpeg_bin), *after]]
+    if _active_hw_encoder(ffmpeg_bin):
+        # The GPU may be out of encode sessions or memory; libx264 always works.
+        cmds.append([*before, *SOFTWARE_ENCODER_ARGS, *after])
+    return cmds
+
+
+def _encode_succeeded(attempt: int, r: subprocess.CompletedProcess) -> bool:
+    global _HW_ENCODER_FAILED
+    if r.returncode != 0:
+        return False
+    if attempt:
+        # Mixing hardware and libx264 output in one run breaks stream-copy concat.
+        _HW_ENCODER_FAILED = True
+    return True
+
 
+def _run_encode_sync(ffmpeg_bin: str, before: list[str], after: list[str]) -> subprocess.CompletedProcess:
+    for attempt, cmd in enumerate(_encode_cmds(ffmpeg_bin, before, after)):
+        r = _run(cmd)
+        if _encode_succeeded(attempt, r):
+            break
+    return r
+
+
+async def _run_encode(ffmpeg_bin: str, before: list[str], after: list[str]) -> subprocess.CompletedProcess:
+    for attempt, cmd in enumerate(_encode_cmds(ffmpeg_bin, before, after)):
+        r = await _run_async(cmd)
+        if _encode_succeeded(attempt, r):
+            break
+    return r
+
+
+def _exact_duration_args(
+    video_path: str, target_duration: float, ffmpeg_bin: str, duration: float
+) -> tuple[list[str], list[str], str]:
     output_path = video_path.replace(".mp4", f"_{target_duration:.2f}s.mp4")
     # Re-encode every prepared clip to avoid pause/freeze artifacts at boundaries.
     # Copy-trimming often cuts on non-keyframes and causes visible hiccups.
-    input_args = ["-i", video_path] if duration > target_duration else ["-stream_loop", "-1", "-i", video_path]
-    cmd = [
-        ffmpeg_bin,
-        *input_args,
-        "-t",
-        str(target_duration),
-        "-vf",
-        "scale=1280:720:force_original_aspect_ratio=decrease,pad=1280:720:(ow-iw)/2:(oh-ih)/2,fps=24,format=yuv420p",
-        "-an",
-        "-c:v",
-        "libx264",
-        "-preset",
-        "veryfast",
-        "-crf",
-        "23",
-        "-movflags",
-        "+faststart",
-        "-y",
-        output_path,
-    ]
-    _run(cmd)
-    return output_path if os.path.exists(output_path) else video_path
+    video_filter = VIDEO_FILTER
+    if duration < target_duration:
+        # Hold the last frame in the same decode pass instead of looping the input through x264.
+        video_filter += f",tpad=stop_mode=clone:stop_duration={target_duration - duration:.3f}"
+    before = [ffmpeg_bin, *FFMPEG_THREAD_ARGS, "-i", video_path, "-t", str(target_duration), "-vf", video_filter, "-an"]
+    return before, ["-movflags", "+faststart", "-y", output_path], output_path
+
+
+def ensure_exact_duration(
+    video_path: str, target_duration: float, ffmpeg_bin: str, duration: Optional[float] = None
+) -> str:
+    if duration is None:
+        duration = get_video_duration(video_path)
+    if duration > 0 and abs(duration - target_duration) < 0.1:
+        return video_path
+    before, after, output_path = _exact_duration_args(video_path, target_duration, ffmpeg_bin, duration)
+    r = _run_encode_sync(ffmpeg_bin, before, after)
+    return output_path if r.returncode == 0 and os.path.exists(output_path) else video_path
 
 
-def create_fallback_clip(index: int, duration: float, ffmpeg_bin: str) -> str:
+async def _ensure_exact_duration_async(
+    video_path: str, target_duration: float, ffmpeg_bin: str, duration: Optional[float] = None
+) -> str:
+    if duration is None:
+        duration = await _probe_duration_async(video_path)
+    if duration > 0 and abs(duration - target_duration) < 0.1:
+        return video_path
+    before, after, output_path = _exact_duration_args(video_path, target_duration, ffmpeg_bin, duration)
+    r = await _run_encode(ffmpeg_bin, before, after)
+    return output_path if r.returncode == 0 and os.path.exists(output_path) else video_path
+
+
+def _fallback_clip_args(index: int, duration: float, ffmpeg_bin: str) -> tuple[list[str], list[str], str]:
     output_path = f"temp_fallback_{index}.mp4"
     colors = ["blue", "green", "red", "purple", "orange", "cyan", "magenta", "yellow"]
     color = colors[index % len(colors)]
-    cmd = [
+    before = [
         ffmpeg_bin,
+        *FFMPEG_THREAD_ARGS,
         "-f",
         "lavfi",
         "-i",
         f"color=c={color}:s=1280x720:d={duration}",
         "-vf",
         f"drawtext=text='Scene {index+1}':fontcolor=white:fontsize=56:x=(w-text_w)/2:y=(h-text_h)/2",
-        "-c:v",
-        "libx264",
-        "-t",
-        str(duration),
-        "-y",
-        output_path,
     ]
-    _run(cmd)
-    return output_path
+    return before, ["-t", str(duration), "-y", output_path], output_path
 
 
-def _prepare_final_audio(ffmpeg_bin: str, input_audio: str, output_audio: str, target_duration: float) -> bool:
-    cmd = [
-        ffmpeg_bin,
-        "-y",
-        "-i",
-        input_audio,
-        "-af",
-        f"loudnorm=I=-16:TP=-1.5:LRA=11,volume=4dB,apad,atrim=0:{target_duration}",
-        "-ar",
-        "44100",
-        "-ac",
-        "2",
-        "-c:a",
-        "aac",
-        "-b:a",
-        "192k",
-        output_audio,
-    ]
-    r = _run(cmd)
-    return r.returncode == 0 and os.path.exists(output_audio)
+def _check_fallback_clip(index: int, r: subprocess.CompletedProcess, output_path: str) -> str:
+    if r.returncode != 0 or not os.path.exists(output_path):
+        raise RuntimeError(f"Fallback clip {index + 1} failed: {r.stderr}")
+    return output_path
 
 
-def _ensure_clip_count(video_files: list[str], expected_clips: int, per_clip: float, ffmpeg_bin: str) -> list[str]:
-    existing = [v for v in video_files if v and os.path.exists(v)]
-    clips = existing[:expected_clips]
-    while len(clips) < expected_clips:
-        clips.append(create_fallback_clip(len(clips), per_clip, ffmpeg_bin))
-    return clips
+def create_fallback_clip(index: int, duration: float, ffmpeg_bin: str) -> str:
+    before, after, output_path = _fallback_clip_args(index, duration, ffmpeg_bin)
+    return _check_fallback_clip(index, _run_encode_sync(ffmpeg_bin, before, after), output_path)
 
 
-def create_video_with_moviepy(
-    video_files,
-    audio_file,
-    output_file="final_video.mp4",
-    target_duration=60,
-    expected_clips=4,
-):
-    from moviepy.editor import AudioFileClip, VideoFileClip, concatenate_videoclips
+async def _create_fallback_clip_async(index: int, duration: float, ffmpeg_bin: str) -> str:
+    before, after, output_path = _fallback_clip_args(index, duration, ffmpeg_bin)
+    return _check_fallback_clip(index, await _run_encode(ffmpeg_bin, before, after), output_path)
 
-    ffmpeg_bin = _resolve_ffmpeg_bin()
-    if not ffmpeg_bin:
-        raise RuntimeError("FFmpeg binary not found. Install ffmpeg or imageio-ffmpeg.")
 
-    final_duration = float(target_duration)
-    clip_count = max(1, int(expected_clips))
-    target_per_clip = final_duration / clip_count
-
-    source_files = _ensure_clip_count(video_files or [], clip_count, target_per_clip, ffmpeg_bin)
-
-    audio_clip = AudioFileClip(audio_file)
-    video_clips = []
-    for i, video_file in enumerate(source_files):
-        clip = VideoFileClip(video_file)
-        clip = clip.resize(height=720)
-        clip = clip.crop(x_center=clip.w / 2, y_center=clip.h / 2, width=1280, height=720)
-        clip = clip.subclip(0, min(clip.duration, target_per_clip))
-        if clip.duration < target_per_clip:
-            clip = clip.loop(duration=target_per_clip)
-        video_clips.append(clip)
-
-    final_video = concatenate_videoclips(video_clips, method="compose")
-    final_video = final_video.subclip(0, min(final_video.duration, final_duration))
-    if final_video.duration < final_duration:
-        final_video = final_video.loop(duration=final_duration)
-
-    audio_for_video = audio_clip.subclip(0, min(audio_clip.duration, final_duration))
-    if audio_for_video.duration < final_duration:
-        audio_for_video = audio_for_video.audio_loop(duration=final_duration)
-
-    final_video = final_video.set_audio(audio_for_video)
-
-    temp_video = output_file.replace(".mp4", "_moviepy_temp.mp4")
-    final_video.write_videofile(
-        temp_video,
-        codec="libx264",
-        audio=True,
-        audio_codec="aac",
-        audio_fps=44100,
-        fps=24,
-        preset="medium",
-        bitrate="2000k",
-        verbose=False,
-        logger=None,
-    )
+def _scan_dir(folder: str) -> set[str]:
+    try:
+        with os.scandir(folder or ".") as it:
+            return {entry.name for entry in it if entry.is_file()}
+    except OSError:
+        return set()
+
+
+async def _ensure_clip_count(
+    video_files: list[str], expected_clips: int, per_clip: float, ffmpeg_bin: str
+) -> list[str]:
+    # One directory listing per folder instead of a stat per clip.
+    listings = {folder: _scan_dir(folder) for folder in {os.path.dirname(v) for v in video_files if v}}
+    existing = [v for v in video_files if v and os.path.basename(v) in listings[os.path.dirname(v)]]
+    clips = existing[:expected_clips]
+    missing = range(len(clips), expected_clips)
+    if missing:
+        fallbacks = [_create_fallback_clip_async(i, per_clip, ffmpeg_bin) for i in missing]
+        clips.extend(await _gather_limited(_encode_workers(len(missing), ffmpeg_bin), fallbacks))
+    return clips
 
-    audio_for_video.close()
-    audio_clip.close()
-    final_video.close()
-    for clip in video_clips:
-        clip.close()
-
-    temp_audio = output_file.replace(".mp4", "_audio_temp.m4a")
-    mux_audio = audio_file
-    if _prepare_final_audio(ffmpeg_bin, audio_file, temp_audio, final_duration):
-        mux_audio = temp_audio
-
-    mux = _run(
-        [
-            ffmpeg_bin,
-            "-y",
-            "-i",
-            temp_video,
-            "-i",
-            mux_audio,
-            "-c:v",
-            "copy",
-            "-c:a",
-            "aac",
-            "-ar",
-            "44100",
-            "-ac",
-            "2",
-            "-b:a",
-            "192k",
-            "-map",
-            "0:v:0",
-            "-map",
-            "1:a:0",
-            "-t",
-            str(final_duration),
-            output_file,
-        ]
-    )
 
-    if mux.returncode != 0 or not os.path.exists(output_file):
-        # Keep at least moviepy output if remux fails.
-        os.replace(temp_video, output_file)
-    elif os.path.exists(temp_video):
-        os.remove(temp_video)
+def _audio_filter(target_duration: float) -> str:
+    return f"loudnorm=I=-16:TP=-1.5:LRA=11,volume=4dB,apad,atrim=0:{target_duration}"
+
+
+AUDIO_OUTPUT_ARGS = ["-c:a", "aac", "-ar", "44100", "-ac", "2", "-b:a", "192k"]
+
+
+def _filter_graph_args(
+    ffmpeg_bin: str, clips: list[str], audio_file: str, per_clip: float, final_duration: float, output_path: str
+) -> tuple[list[str], list[str]]:
+    # Decode every source once; normalize/trim/concat video and loudnorm the narration
+    # inside a single encode that writes the final file directly.
+    input_args: list[str] = []
+    chains: list[str] = []
+    for i, clip in enumerate(clips):
+        input_args += ["-i", clip]
+        # Short clips hold their last frame, matching _ensure_exact_duration_async; the pad
+        # is only emitted after EOF, so longer clips are cut by trim before it starts.
+        chains.append(
+            f"[{i}:v]{VIDEO_FILTER},setsar=1,tpad=stop_mode=clone:stop_duration={per_clip:.3f},"
+            f"trim=0:{per_clip:.3f},setpts=PTS-STARTPTS[v{i}]"
+        )
+    labels = "".join(f"[v{i}]" for i in range(len(clips)))
+    # setpts drops the frame rate from each link; restore 24 fps so the encoder doesn't default to 25.
+    chains.append(f"{labels}concat=n={len(clips)}:v=1:a=0,fps=24[outv]")
+    chains.append(f"[{len(clips)}:a]{_audio_filter(final_duration)}[outa]")
+    before = [
+        ffmpeg_bin,
+        *FFMPEG_THREAD_ARGS,
+        *input_args,
+        "-i",
+        audio_file,
+        "-filter_complex",
+        ";".join(chains),
+        "-map",
+        "[outv]",
+        "-map",
+        "[outa]",
+    ]
+    after = [*AUDIO_OUTPUT_ARGS, "-t", str(final_duration), "-movflags", "+faststart", "-y", output_path]
+    return before, after
+
+
+async def _concat_prepared_clips(
+    ffmpeg_bin: str,
+    clips: list[str],
+    audio_file: str,
+    per_clip: float,
+    final_duration: float,
+    output_path: str,
+    started_on_hw: bool,
+) -> subprocess.CompletedProcess:
+    durations = await _probe_durations_async(clips)
+    prepared = [_ensure_exact_duration_async(v, per_clip, ffmpeg_bin, durations.get(v)) for v in clips]
+    processed = await _gather_limited(_encode_workers(len(clips), ffmpeg_bin), prepared)
 
-    if os.path.exists(temp_audio):
-        os.remove(temp_audio)
+    with open("concat_list.txt", "w", encoding="utf-8") as f:
+        for video in processed:
+            f.write(f"file '{os.path.abspath(video)}'\n")
 
-    return output_file
+    before = [
+        ffmpeg_bin,
+        *FFMPEG_THREAD_ARGS,
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        "concat_list.txt",
+        "-i",
+        audio_file,
+        "-map",
+        "0:v:0",
+        "-map",
+        "1:a:0",
+    ]
+    after = ["-af", _audio_filter(final_duration), *AUDIO_OUTPUT_ARGS, "-t", str(final_duration), "-y", output_path]
+    if started_on_hw and not _active_hw_encoder(ffmpeg_bin):
+        # Some clips came from the GPU and some from the libx264 retry; their SPS/profile
+        # differ, so re-encode the joined stream instead of stream-copying it.
+        r = await _run_encode(ffmpeg_bin, before, after)
+    else:
+        r = await _run_async([*before, "-c:v", "copy", *after])
+    if os.path.exists("concat_list.txt"):
+        os.remove("concat_list.txt")
+    return r
+
+
+async def _assemble_video(
+    ffmpeg_bin: str, video_files: list[str], audio_file: str, output_file: str, final_duration: float, clip_count: int
+) -> subprocess.CompletedProcess:
+    per_clip = final_duration / clip_count
+    started_on_hw = _active_hw_encoder(ffmpeg_bin) is not None
+    source_files = await _ensure_clip_count(video_files, clip_count, per_clip, ffmpeg_bin)
+
+    before, after = _filter_graph_args(ffmpeg_bin, source_files, audio_file, per_clip, final_duration, output_file)
+    graph_cmd = [*before, *_video_encoder_args(ffmpeg_bin), *after]
+    if len(subprocess.list2cmdline(graph_cmd)) <= MAX_COMMAND_CHARS:
+        return await _run_encode(ffmpeg_bin, before, after)
+    return await _concat_prepared_clips(
+        ffmpeg_bin, source_files, audio_file, per_clip, final_duration, output_file, started_on_hw
+    )
 
 
 def create_video_ffmpeg(
@@ -295,58 +416,12 @@ def create_video_ffmpeg(
     if final_duration <= 0:
         final_duration = 30.0
     clip_count = max(1, int(expected_clips))
-    per_clip = final_duration / clip_count
-
-    source_files = _ensure_clip_count(video_files or [], clip_count, per_clip, ffmpeg_bin)
-    processed = [ensure_exact_duration(v, per_clip, ffmpeg_bin) for v in source_files]
-
-    with open("concat_list.txt", "w", encoding="utf-8") as f:
-        for video in processed:
-            f.write(f"file '{os.path.abspath(video)}'\n")
-
-    temp_concat = "temp_concat.mp4"
-    r1 = _run([ffmpeg_bin, "-f", "concat", "-safe", "0", "-i", "concat_list.txt", "-c", "copy", temp_concat, "-y"])
-    if r1.returncode != 0:
-        raise RuntimeError(f"Video concat failed: {r1.stderr}")
-
-    temp_audio = output_file.replace(".mp4", "_audio_temp.m4a")
-    mux_audio = audio_file
-    if _prepare_final_audio(ffmpeg_bin, audio_file, temp_audio, final_duration):
-        mux_audio = temp_audio
-
-    r2 = _run(
-        [
-            ffmpeg_bin,
-            "-i",
-            temp_concat,
-            "-i",
-            mux_audio,
-            "-c:v",
-            "copy",
-            "-c:a",
-            "aac",
-            "-ar",
-            "44100",
-            "-ac",
-            "2",
-            "-b:a",
-            "192k",
-            "-map",
-            "0:v:0",
-            "-map",
-            "1:a:0",
-            "-t",
-            str(final_duration),
-            output_file,
-            "-y",
-        ]
-    )
-    if r2.returncode != 0:
-        raise RuntimeError(f"Final mux failed: {r2.stderr}")
 
-    for path in ["concat_list.txt", temp_concat, temp_audio]:
-        if os.path.exists(path):
-            os.remove(path)
+    # Detect the encoder up front so the blocking probe never runs inside the event loop.
+    _video_encoder_args(ffmpeg_bin)
+    r = asyncio.run(_assemble_video(ffmpeg_bin, video_files or [], audio_file, output_file, final_duration, clip_count))
+    if r.returncode != 0:
+        raise RuntimeError(f"Video assembly failed: {r.stderr}")
 
     return output_file
 
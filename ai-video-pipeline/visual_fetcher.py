@@ -1,13 +1,25 @@
+import atexit
+import functools
+import hashlib
 import json
 import os
+import queue
 import re
 import shutil
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 
-import requests
+import httpx
 from dotenv import load_dotenv
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 load_dotenv()
 
 PEXELS_API_KEY = os.getenv("PEXELS_API_KEY")
@@ -15,14 +27,45 @@ PEXELS_VIDEO_SEARCH_URL = "https://api.pexels.com/videos/search"
 
 MAX_DOWNLOAD_BYTES = int(os.getenv("MAX_DOWNLOAD_BYTES", str(8 * 1024 * 1024)))
 MAX_DOWNLOAD_SECONDS = int(os.getenv("MAX_DOWNLOAD_SECONDS", "20"))
+DOWNLOAD_CHUNK_BYTES = int(os.getenv("DOWNLOAD_CHUNK_BYTES", str(256 * 1024)))
+# Unbuffered writes straight to the fd; O_BINARY keeps Windows from translating bytes.
+_DOWNLOAD_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
 MAX_VISUAL_DOWNLOADS = int(os.getenv("MAX_VISUAL_DOWNLOADS", "8"))
+VISUAL_WORKERS = max(1, int(os.getenv("VISUAL_WORKERS", "6")))
+# Linux FICLONE ioctl: copy-on-write clone on btrfs/XFS and friends.
+_FICLONE = 0x40049409 if fcntl is not None and sys.platform.startswith("linux") else None
+# Symlinks need elevated privileges on Windows, so only default them on for POSIX.
+SYMLINK_CACHE_FALLBACK = os.getenv("SYMLINK_CACHE_FALLBACK", "1" if os.name == "posix" else "0") == "1"
 
 PEXELS_MAX_RETRIES = int(os.getenv("PEXELS_MAX_RETRIES", "3"))
 PEXELS_RETRY_BACKOFF_SECONDS = float(os.getenv("PEXELS_RETRY_BACKOFF_SECONDS", "1.5"))
+PEXELS_CACHE_TTL_SECONDS = int(os.getenv("PEXELS_CACHE_TTL_SECONDS", "3600"))
 
 ENABLE_VISUAL_CACHE = os.getenv("ENABLE_VISUAL_CACHE", "1") == "1"
 VISUAL_CACHE_DIR = os.getenv("VISUAL_CACHE_DIR", "visuals/cache")
+_SEARCH_CACHE_DIR = os.path.join(VISUAL_CACHE_DIR, "_search")
 VISUAL_QUALITY_LOG_PATH = os.getenv("VISUAL_QUALITY_LOG_PATH", "outputs/visual_quality_log.jsonl")
+LOG_BATCH_SIZE = 64
+LOG_FLUSH_INTERVAL_SECONDS = 0.2
+
+_USED_IDS_LOCK = threading.Lock()
+# Set on Ctrl-C so in-flight downloads stop at their next chunk.
+_STOP_DOWNLOADS = threading.Event()
+_DIRS_LOCK = threading.Lock()
+_DIRS_READY = False
+_CACHE_LISTING: tuple[int, list[tuple[str, str]]] = (-1, [])
+# Normalized query -> (fetched_at, videos); entries expire with PEXELS_CACHE_TTL_SECONDS.
+_SEARCH_MEMO: dict[str, tuple[float, list[dict]]] = {}
+_SEARCH_MEMO_LOCK = threading.Lock()
+SEARCH_MEMO_SIZE = 256
+
+# One HTTP/2 client shared by all workers: searches and CDN fetches multiplex over pooled connections.
+_CLIENT = httpx.Client(
+    http2=True,
+    follow_redirects=True,
+    timeout=httpx.Timeout(8.0, read=20.0),
+    limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+)
 
 DOMAIN_HINTS = {
     "healthcare": ["hospital", "doctor", "patient", "medical", "clinic", "surgery"],
@@ -30,30 +73,14 @@ DOMAIN_HINTS = {
     "robot": ["robot", "technology"],
     "ai": ["technology", "digital"],
 }
-
-
-def _tokenize(text: str) -> set[str]:
-    return set(re.findall(r"[a-z0-9]+", text.lower()))
-
-
-def _safe_filename(text: str, max_len: int = 80) -> str:
-    text = re.sub(r"[^a-zA-Z0-9_-]+", "_", text.strip().lower())
-    text = re.sub(r"_+", "_", text).strip("_")
-    return text[:max_len] or "query"
-
-
-def _append_quality_log(record: dict) -> None:
-    try:
-        os.makedirs(os.path.dirname(VISUAL_QUALITY_LOG_PATH) or ".", exist_ok=True)
-        with open(VISUAL_QUALITY_LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
-    except Exception:
-        pass
-
-
-def extract_keywords(script_text: str) -> list[str]:
-    keywords: list[str] = []
-    stopwords = {
+_DOMAIN_TRIGGERS = tuple(DOMAIN_HINTS.items())
+# Lookahead so overlapping triggers at different positions all match. At one position only
+# the longest trigger is reported, so a trigger that is a prefix of another would be missed
+# where they coincide; none of the current triggers are.
+_DOMAIN_RE = re.compile("(?=(" + "|".join(re.escape(t) for t in sorted(DOMAIN_HINTS, key=len, reverse=True)) + "))")
+
+_STOPWORDS: frozenset[str] = frozenset(
+    {
         "a",
         "an",
         "the",
@@ -74,6 +101,97 @@ def extract_keywords(script_text: str) -> list[str]:
         "small",
         "worldwide",
     }
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_UNSAFE_CHARS_RE = re.compile(r"[^a-zA-Z0-9_-]+")
+_UNDERSCORES_RE = re.compile(r"_+")
+
+
+@functools.lru_cache(maxsize=4096)
+def _tokenize(text: str) -> frozenset[str]:
+    return frozenset(_TOKEN_RE.findall(text.lower()))
+
+
+def _safe_filename(text: str, max_len: int = 80) -> str:
+    text = _UNSAFE_CHARS_RE.sub("_", text.strip().lower())
+    text = _UNDERSCORES_RE.sub("_", text).strip("_")
+    return text[:max_len] or "query"
+
+
+def _ensure_dirs() -> None:
+    """Create the log and cache directories once per process instead of before every write."""
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+    with _DIRS_LOCK:
+        if _DIRS_READY:
+            return
+        dirs = [os.path.dirname(VISUAL_QUALITY_LOG_PATH) or "."]
+        if ENABLE_VISUAL_CACHE:
+            dirs.append(VISUAL_CACHE_DIR)
+            if PEXELS_CACHE_TTL_SECONDS > 0:
+                dirs.append(_SEARCH_CACHE_DIR)
+        try:
+            for path in dirs:
+                os.makedirs(path, exist_ok=True)
+        except OSError:
+            return
+        _DIRS_READY = True
+
+
+def _write_log_batch(batch: list[dict]) -> None:
+    _ensure_dirs()
+    try:
+        with open(VISUAL_QUALITY_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch))
+    except Exception:
+        pass
+
+
+def _log_writer() -> None:
+    # Single consumer: gather up to LOG_BATCH_SIZE records or LOG_FLUSH_INTERVAL_SECONDS
+    # worth, then append them with one open/write. Events in the queue are flush requests.
+    while True:
+        batch: list[dict] = []
+        waiters: list[threading.Event] = []
+        item = _LOG_QUEUE.get()
+        deadline = time.monotonic() + LOG_FLUSH_INTERVAL_SECONDS
+        while True:
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                break
+            batch.append(item)
+            remaining = deadline - time.monotonic()
+            if len(batch) >= LOG_BATCH_SIZE or remaining <= 0:
+                break
+            try:
+                item = _LOG_QUEUE.get(timeout=remaining)
+            except queue.Empty:
+                break
+        if batch:
+            _write_log_batch(batch)
+        for waiter in waiters:
+            waiter.set()
+
+
+def _flush_log(timeout: float = 5.0) -> None:
+    done = threading.Event()
+    _LOG_QUEUE.put(done)
+    done.wait(timeout)
+
+
+def _append_quality_log(record: dict) -> None:
+    _LOG_QUEUE.put(record)
+
+
+_LOG_QUEUE: queue.SimpleQueue = queue.SimpleQueue()
+threading.Thread(target=_log_writer, name="visual-quality-log", daemon=True).start()
+atexit.register(_flush_log)
+
+
+def extract_keywords(script_text: str) -> list[str]:
+    keywords: list[str] = []
 
     lines = [line.strip() for line in script_text.splitlines() if line.strip()]
     for i, line in enumerate(lines):
@@ -87,11 +205,12 @@ def extract_keywords(script_text: str) -> list[str]:
 
         combined = f"{visual_desc} {narration}".lower()
         words = [w.strip(".,") for w in combined.split()]
-        filtered = [w for w in words if w and w not in stopwords]
+        filtered = [w for w in words if w and w not in _STOPWORDS]
         query_terms = filtered[:7]
 
-        for trigger, hints in DOMAIN_HINTS.items():
-            if trigger in combined:
+        matched = set(_DOMAIN_RE.findall(combined))
+        for trigger, hints in _DOMAIN_TRIGGERS:
+            if trigger in matched:
                 for hint in hints:
                     if hint not in query_terms:
                         query_terms.append(hint)
@@ -104,13 +223,56 @@ def extract_keywords(script_text: str) -> list[str]:
 
 
 def _search_video(search_query: str) -> list[dict]:
+    if PEXELS_CACHE_TTL_SECONDS <= 0:
+        return _fetch_search_results(search_query)
+
+    # Token-sorted key so reordered/duplicated wording shares one cache entry;
+    # Pexels itself still receives the query as written.
+    key = " ".join(sorted(_tokenize(search_query))) or search_query.strip()
+    now = time.time()
+    with _SEARCH_MEMO_LOCK:
+        hit = _SEARCH_MEMO.get(key)
+    if hit is not None and now - hit[0] < PEXELS_CACHE_TTL_SECONDS:
+        return hit[1]
+
+    cache_path = os.path.join(_SEARCH_CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+    videos = None
+    try:
+        fetched_at = os.path.getmtime(cache_path)
+        if now - fetched_at < PEXELS_CACHE_TTL_SECONDS:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                videos = json.load(f)
+        else:
+            os.remove(cache_path)
+    except (OSError, ValueError):
+        pass
+
+    if videos is None:
+        videos = _fetch_search_results(search_query)
+        fetched_at = now
+        try:
+            _ensure_dirs()
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(videos, f)
+        except OSError:
+            pass
+
+    with _SEARCH_MEMO_LOCK:
+        _SEARCH_MEMO.pop(key, None)
+        if len(_SEARCH_MEMO) >= SEARCH_MEMO_SIZE:
+            _SEARCH_MEMO.pop(next(iter(_SEARCH_MEMO)))
+        _SEARCH_MEMO[key] = (fetched_at, videos)
+    return videos
+
+
+def _fetch_search_results(search_query: str) -> list[dict]:
     headers = {"Authorization": PEXELS_API_KEY}
     params = {"query": search_query, "per_page": 10, "page": 1}
 
     last_exc: Optional[Exception] = None
     for attempt in range(1, PEXELS_MAX_RETRIES + 1):
         try:
-            response = requests.get(PEXELS_VIDEO_SEARCH_URL, headers=headers, params=params, timeout=20)
+            response = _CLIENT.get(PEXELS_VIDEO_SEARCH_URL, headers=headers, params=params, timeout=20)
             response.raise_for_status()
             return response.json().get("videos", [])
         except Exception as exc:
@@ -121,8 +283,7 @@ def _search_video(search_query: str) -> list[dict]:
     raise RuntimeError(f"Pexels search failed after {PEXELS_MAX_RETRIES} attempts: {last_exc}")
 
 
-def _score_video(video: dict, query: str) -> dict:
-    q = _tokenize(query)
+def _score_video(video: dict, q: frozenset[str]) -> dict:
     slug = _tokenize(video.get("url", ""))
     overlap = len(q & slug)
     title_overlap = len(q & _tokenize(video.get("user", {}).get("name", "")))
@@ -144,81 +305,181 @@ def _pick_video_url(video: dict) -> Optional[str]:
     if not mp4_files:
         return None
 
-    preferred = sorted(
+    preferred = min(
         mp4_files,
         key=lambda f: ((f.get("width") or 1280) * (f.get("height") or 720), abs((f.get("height") or 720) - 720)),
     )
-    return preferred[0].get("link")
+    return preferred.get("link")
 
 
-def _select_best_video(search_query: str, used_ids: set[int]) -> tuple[Optional[dict], Optional[dict]]:
-    videos = _search_video(search_query)
+def _select_best_video(
+    search_query: str, used_ids: set[int], videos: Optional[list[dict]] = None
+) -> list[tuple[dict, dict]]:
+    """Return (video, score) pairs, best first."""
+    if videos is None:
+        videos = _search_video(search_query)
     if not videos:
-        return None, None
+        return []
 
     candidates = [v for v in videos if v.get("id") not in used_ids] or videos
-    scored = [(v, _score_video(v, search_query)) for v in candidates]
-    scored.sort(key=lambda x: x[1]["score"], reverse=True)
+    query_tokens = _tokenize(search_query)
+    scored = [(v, _score_video(v, query_tokens)) for v in candidates]
+    return sorted(scored, key=lambda x: x[1]["score"], reverse=True)
 
-    best_video, best_score = scored[0]
-    return best_video, best_score
+
+def _fast_clone(src: str, dst: str) -> None:
+    """Populate dst from src via hardlink, then reflink, falling back to a byte copy."""
+    # Never write through an existing dst: it may itself be a hardlink into the cache.
+    try:
+        os.remove(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    if _FICLONE is not None:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def _link_cached_clip(cached: str, output_path: str) -> None:
+    if SYMLINK_CACHE_FALLBACK:
+        try:
+            os.remove(output_path)
+        except FileNotFoundError:
+            pass
+        try:
+            os.symlink(os.path.abspath(cached), output_path)
+            return
+        except OSError:
+            pass
+    _fast_clone(cached, output_path)
 
 
 def _store_in_cache(local_file: str, search_query: str, video_id: Optional[int]) -> Optional[str]:
     if not ENABLE_VISUAL_CACHE:
         return None
     try:
-        os.makedirs(VISUAL_CACHE_DIR, exist_ok=True)
+        _ensure_dirs()
         stamp = int(time.time())
         cache_name = f"{video_id or 'local'}_{_safe_filename(search_query)}_{stamp}.mp4"
         cache_path = os.path.join(VISUAL_CACHE_DIR, cache_name)
-        shutil.copy2(local_file, cache_path)
+        _fast_clone(local_file, cache_path)
         return cache_path
     except Exception:
         return None
 
 
-def _find_cached_clip(search_query: str) -> Optional[str]:
-    if not ENABLE_VISUAL_CACHE or not os.path.isdir(VISUAL_CACHE_DIR):
+def _list_cached_clips() -> list[tuple[str, str]]:
+    """Return (name, path) for cached mp4s, rescanning only when the directory changed."""
+    global _CACHE_LISTING
+    try:
+        mtime = os.stat(VISUAL_CACHE_DIR).st_mtime_ns
+    except OSError:
+        return []
+    cached_mtime, clips = _CACHE_LISTING
+    if cached_mtime == mtime:
+        return clips
+
+    with os.scandir(VISUAL_CACHE_DIR) as it:
+        clips = [
+            (entry.name, entry.path)
+            for entry in it
+            if entry.name.lower().endswith(".mp4") and entry.is_file(follow_symlinks=False)
+        ]
+    _CACHE_LISTING = (mtime, clips)
+    return clips
+
+
+def _snapshot_cache() -> list[tuple[str, frozenset[str]]]:
+    """Tokenize the cache listing once so a whole fetch_visuals run can search it in memory."""
+    if not ENABLE_VISUAL_CACHE:
+        return []
+    return [(path, _tokenize(name)) for name, path in _list_cached_clips()]
+
+
+def _find_cached_clip(
+    search_query: str, snapshot: Optional[list[tuple[str, frozenset[str]]]] = None
+) -> Optional[str]:
+    if not ENABLE_VISUAL_CACHE:
         return None
 
     query_tokens = _tokenize(search_query)
+    if snapshot is None:
+        snapshot = _snapshot_cache()
+
     best_path = None
     best_score = -1
 
-    for name in os.listdir(VISUAL_CACHE_DIR):
-        if not name.lower().endswith(".mp4"):
-            continue
-        path = os.path.join(VISUAL_CACHE_DIR, name)
-        score = len(query_tokens & _tokenize(name))
+    for path, tokens in snapshot:
+        score = len(query_tokens & tokens)
         if score > best_score:
             best_score = score
             best_path = path
+            if score == len(query_tokens):
+                break
 
     if best_score <= 0:
         return None
     return best_path
 
 
+class OversizeError(RuntimeError):
+    """Raised when a clip is larger than MAX_DOWNLOAD_BYTES."""
+
+
+class DownloadCancelled(RuntimeError):
+    """Raised when fetch_visuals was interrupted mid-download."""
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
 def _download_with_retry(video_url: str, output_path: str) -> None:
     last_exc: Optional[Exception] = None
 
     for attempt in range(1, PEXELS_MAX_RETRIES + 1):
+        if _STOP_DOWNLOADS.is_set():
+            raise DownloadCancelled("Video download cancelled.")
         try:
             start = time.monotonic()
-            with requests.get(video_url, timeout=(8, 8), stream=True) as response:
+            with _CLIENT.stream("GET", video_url, timeout=8) as response:
                 response.raise_for_status()
+                content_length = int(response.headers.get("Content-Length", "0") or 0)
+                if content_length > MAX_DOWNLOAD_BYTES:
+                    raise OversizeError(f"Video is {content_length} bytes, limit is {MAX_DOWNLOAD_BYTES}.")
                 total = 0
-                with open(output_path, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                # Unlink first so a clip hardlinked from the cache is replaced, not truncated.
+                try:
+                    os.remove(output_path)
+                except FileNotFoundError:
+                    pass
+                fd = os.open(output_path, _DOWNLOAD_OPEN_FLAGS, 0o644)
+                try:
+                    for chunk in response.iter_bytes(DOWNLOAD_CHUNK_BYTES):
+                        if _STOP_DOWNLOADS.is_set():
+                            raise DownloadCancelled("Video download cancelled.")
                         if not chunk:
                             continue
                         if time.monotonic() - start > MAX_DOWNLOAD_SECONDS:
                             raise TimeoutError("Video download exceeded time limit.")
                         total += len(chunk)
                         if total > MAX_DOWNLOAD_BYTES:
-                            raise TimeoutError("Video too large for quick pipeline run.")
-                        f.write(chunk)
+                            raise OversizeError("Video too large for quick pipeline run.")
+                        _write_all(fd, chunk)
+                finally:
+                    os.close(fd)
             return
         except Exception as exc:
             last_exc = exc
@@ -227,13 +488,22 @@ def _download_with_retry(video_url: str, output_path: str) -> None:
                     os.remove(output_path)
                 except OSError:
                     pass
+            # The same URL will be just as large next time; let the caller try another clip.
+            if isinstance(exc, (OversizeError, DownloadCancelled)):
+                raise
             if attempt < PEXELS_MAX_RETRIES:
-                time.sleep(PEXELS_RETRY_BACKOFF_SECONDS * attempt)
+                _STOP_DOWNLOADS.wait(PEXELS_RETRY_BACKOFF_SECONDS * attempt)
 
     raise RuntimeError(f"Video download failed after {PEXELS_MAX_RETRIES} attempts: {last_exc}")
 
 
-def download_video(search_query: str, output_path: str, used_ids: set[int], scene_index: int) -> bool:
+def download_video(
+    search_query: str,
+    output_path: str,
+    used_ids: set[int],
+    scene_index: int,
+    cache_snapshot: Optional[list[tuple[str, frozenset[str]]]] = None,
+) -> bool:
     log_record = {
         "scene": scene_index,
         "query": search_query,
@@ -245,48 +515,72 @@ def download_video(search_query: str, output_path: str, used_ids: set[int], scen
         "timestamp": int(time.time()),
     }
 
+    video_id = None
+    # Only the id this call added; when every candidate was already taken, another scene owns it.
+    reserved_id = None
     try:
-        video, score_data = _select_best_video(search_query, used_ids)
-        if not video:
+        videos = _search_video(search_query)
+        with _USED_IDS_LOCK:
+            # Rank and reserve the top pick under the lock so parallel scenes don't grab the same clip.
+            ranked = _select_best_video(search_query, used_ids, videos)
+            video_id = ranked[0][0].get("id") if ranked else None
+            if video_id is not None and video_id not in used_ids:
+                used_ids.add(video_id)
+                reserved_id = video_id
+        if not ranked:
             raise RuntimeError("No video candidates returned")
 
-        video_id = video.get("id")
-        video_url = _pick_video_url(video)
-        if not video_url:
-            raise RuntimeError("No usable MP4 URL")
-
-        _download_with_retry(video_url, output_path)
-
-        if video_id is not None:
-            used_ids.add(video_id)
+        last_exc: Optional[Exception] = None
+        for rank, (video, score_data) in enumerate(ranked):
+            if rank:
+                with _USED_IDS_LOCK:
+                    # Move the reservation to the next candidate unless another scene took it meanwhile.
+                    if reserved_id is not None:
+                        used_ids.discard(reserved_id)
+                        reserved_id = None
+                    video_id = video.get("id")
+                    if video_id in used_ids:
+                        continue
+                    if video_id is not None:
+                        used_ids.add(video_id)
+                        reserved_id = video_id
+
+            video_url = _pick_video_url(video)
+            if not video_url:
+                last_exc = RuntimeError("No usable MP4 URL")
+                continue
+            try:
+                _download_with_retry(video_url, output_path)
+                break
+            except OversizeError as exc:
+                last_exc = exc
+        else:
+            raise last_exc
 
         _store_in_cache(output_path, search_query, video_id)
 
-        log_record.update(
-            {
-                "source": "pexels",
-                "video_id": video_id,
-                "score": score_data,
-                "status": "ok",
-            }
-        )
+        log_record["source"] = "pexels"
+        log_record["video_id"] = video_id
+        log_record["score"] = score_data
+        log_record["status"] = "ok"
         _append_quality_log(log_record)
         print(f"Downloaded: {output_path}")
         return True
 
     except Exception as exc:
-        cached = _find_cached_clip(search_query)
+        if reserved_id is not None:
+            with _USED_IDS_LOCK:
+                used_ids.discard(reserved_id)
+
+        cancelled = isinstance(exc, DownloadCancelled)
+        cached = None if cancelled else _find_cached_clip(search_query, snapshot=cache_snapshot)
         if cached:
             try:
-                shutil.copy2(cached, output_path)
-                log_record.update(
-                    {
-                        "source": "cache_fallback",
-                        "status": "ok",
-                        "cache_path": cached,
-                        "error": str(exc),
-                    }
-                )
+                _link_cached_clip(cached, output_path)
+                log_record["source"] = "cache_fallback"
+                log_record["status"] = "ok"
+                log_record["cache_path"] = cached
+                log_record["error"] = str(exc)
                 _append_quality_log(log_record)
                 print(f"Used cached clip for '{search_query}': {output_path}")
                 return True
@@ -299,9 +593,12 @@ def download_video(search_query: str, output_path: str, used_ids: set[int], scen
             except OSError:
                 pass
 
-        log_record.update({"status": "failed", "error": str(exc), "source": "none"})
+        log_record["status"] = "cancelled" if cancelled else "failed"
+        log_record["error"] = str(exc)
+        log_record["source"] = "none"
         _append_quality_log(log_record)
-        print(f"Failed to download '{search_query}': {exc}")
+        if not cancelled:
+            print(f"Failed to download '{search_query}': {exc}")
         return False
 
 
@@ -311,21 +608,36 @@ def fetch_visuals(script_text: str, output_folder: str = "visuals") -> list[str]
         return []
 
     os.makedirs(output_folder, exist_ok=True)
+    _ensure_dirs()
+    _STOP_DOWNLOADS.clear()
+    cache_snapshot = _snapshot_cache()
     keywords = extract_keywords(script_text)
-    downloaded: list[str] = []
     used_ids: set[int] = set()
+    jobs = [(i, keyword, os.path.join(output_folder, f"video_{i}.mp4")) for i, keyword in enumerate(keywords, start=1)]
+    if not jobs:
+        return []
 
-    for i, keyword in enumerate(keywords, start=1):
-        output_path = os.path.join(output_folder, f"video_{i}.mp4")
-        try:
-            ok = download_video(keyword, output_path, used_ids, scene_index=i)
-        except KeyboardInterrupt:
-            print("Visual download interrupted. Continuing with downloaded clips.")
-            break
-        if ok:
-            downloaded.append(output_path)
-
-    return downloaded
+    downloaded: dict[int, str] = {}
+    executor = ThreadPoolExecutor(max_workers=min(VISUAL_WORKERS, len(jobs)))
+    futures = {
+        executor.submit(download_video, keyword, output_path, used_ids, i, cache_snapshot): (i, output_path)
+        for i, keyword, output_path in jobs
+    }
+    try:
+        for future in as_completed(futures):
+            i, output_path = futures[future]
+            if future.result():
+                downloaded[i] = output_path
+    except KeyboardInterrupt:
+        print("Visual download interrupted. Continuing with downloaded clips.")
+        _STOP_DOWNLOADS.set()
+        # Workers drop their partial files at the next chunk; wait so none write during assembly.
+        executor.shutdown(wait=True, cancel_futures=True)
+    else:
+        executor.shutdown()
+
+    _flush_log()
+    return [downloaded[i] for i in sorted(downloaded)]
 
 
 if __name__ == "__main__":
@@ -1,10 +1,13 @@
 import asyncio
+import atexit
+import functools
 import inspect
 import os
 import re
 import shutil
 import subprocess
-import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import edge_tts
 from dotenv import load_dotenv
@@ -16,7 +19,24 @@ TTS_RATE = os.getenv("TTS_RATE", "-10%")
 TTS_VOLUME = os.getenv("TTS_VOLUME", "+0%")
 TTS_FALLBACK_RATE = int(os.getenv("TTS_FALLBACK_RATE", "-1"))
 
+_LABEL_RE_1 = re.compile(r"^(narration|scene|line)\s*(\d+)?\s*[:\-]\s*", re.IGNORECASE)
+_LABEL_RE_2 = re.compile(r"^(narration|scene|line)\s+(\d+)\.?\s*", re.IGNORECASE)
+_VISUAL_TAG_RE = re.compile(r"\[VISUAL\]:")
+_WS_RE = re.compile(r"\s+")
+_SENT_RE = re.compile(r"([.!?])\s+")
 
+try:
+    _EDGE_PITCH_SUPPORTED = "pitch" in inspect.signature(edge_tts.Communicate.__init__).parameters
+except (TypeError, ValueError):
+    _EDGE_PITCH_SUPPORTED = False
+
+# One reusable loop per calling thread, so parallel callers never wait on each other.
+_THREAD_STATE = threading.local()
+_LOOPS: list[asyncio.AbstractEventLoop] = []
+_LOOPS_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
 def _resolve_ffmpeg_binary():
     ffmpeg_bin = shutil.which("ffmpeg")
     if ffmpeg_bin:
@@ -32,21 +52,17 @@ def _resolve_ffmpeg_binary():
 def _clean_script_for_speech(script_text: str) -> str:
     lines = [line.strip() for line in script_text.splitlines() if line.strip()]
     narration = [line for line in lines if not line.startswith("[VISUAL]:")]
-    narration = [
-        re.sub(r"^(narration|scene|line)\s*(\d+)?\s*[:\-]\s*", "", line, flags=re.IGNORECASE)
-        for line in narration
-    ]
-    narration = [re.sub(r"^(narration|scene|line)\s+(\d+)\.?\s*", "", line, flags=re.IGNORECASE) for line in narration]
-    text = " ".join(narration) if narration else re.sub(r"\[VISUAL\]:", "", script_text)
-    text = re.sub(r"\s+", " ", text).strip()
-    text = re.sub(r"([.!?])\s+", r"\1  ", text)
+    narration = [_LABEL_RE_1.sub("", line) for line in narration]
+    narration = [_LABEL_RE_2.sub("", line) for line in narration]
+    text = " ".join(narration) if narration else _VISUAL_TAG_RE.sub("", script_text)
+    text = _WS_RE.sub(" ", text).strip()
+    text = _SENT_RE.sub(r"\1  ", text)
     return text
 
 
 async def _generate_with_edge(text: str, output_file: str) -> str:
-    supported = set(inspect.signature(edge_tts.Communicate.__init__).parameters)
     kwargs = {"rate": TTS_RATE, "volume": TTS_VOLUME}
-    if "pitch" in supported:
+    if _EDGE_PITCH_SUPPORTED:
         kwargs["pitch"] = os.getenv("TTS_PITCH", "+0Hz")
 
     communicate = edge_tts.Communicate(text, TTS_VOICE, **kwargs)
@@ -61,26 +77,24 @@ def _generate_with_windows_tts(text: str, output_file: str) -> str:
     escaped_path = wav_file.replace("'", "''")
     rate = max(-10, min(10, TTS_FALLBACK_RATE))
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".txt", mode="w", encoding="utf-8") as tf:
-        tf.write(text)
-        text_file = tf.name
-    escaped_text_file = text_file.replace("'", "''")
-
     ps_cmd = (
         "Add-Type -AssemblyName System.Speech; "
         "$s = New-Object System.Speech.Synthesis.SpeechSynthesizer; "
         f"$s.Rate={rate}; "
-        "$t = Get-Content -Raw -LiteralPath '" + escaped_text_file + "'; "
+        "[Console]::InputEncoding = [System.Text.Encoding]::UTF8; "
+        "$t = [Console]::In.ReadToEnd(); "
         "$s.SetOutputToWaveFile('" + escaped_path + "'); "
         "$s.Speak($t); "
         "$s.Dispose();"
     )
 
-    r = subprocess.run(["powershell", "-NoProfile", "-Command", ps_cmd], capture_output=True, text=True)
-    try:
-        os.remove(text_file)
-    except OSError:
-        pass
+    r = subprocess.run(
+        ["powershell", "-NoProfile", "-Command", ps_cmd],
+        input=text,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+    )
     if r.returncode != 0 or not os.path.exists(wav_file):
         raise RuntimeError(f"Windows TTS fallback failed: {r.stderr}")
 
@@ -113,12 +127,39 @@ async def generate_voiceover(script_text: str, output_file: str = "voiceover.mp3
         return out
 
 
-def generate_voiceover_sync(script_text: str, output_file: str = "voiceover.mp3") -> str:
-    try:
-        return asyncio.run(generate_voiceover(script_text, output_file))
-    except RuntimeError:
+def _thread_loop() -> asyncio.AbstractEventLoop:
+    loop = getattr(_THREAD_STATE, "loop", None)
+    if loop is None or loop.is_closed():
         loop = asyncio.new_event_loop()
+        _THREAD_STATE.loop = loop
+        with _LOOPS_LOCK:
+            _LOOPS.append(loop)
+    return loop
+
+
+def _close_loops() -> None:
+    with _LOOPS_LOCK:
+        loops = list(_LOOPS)
+        _LOOPS.clear()
+    for loop in loops:
+        if loop.is_closed() or loop.is_running():
+            continue
         try:
-            return loop.run_until_complete(generate_voiceover(script_text, output_file))
+            loop.run_until_complete(loop.shutdown_asyncgens())
         finally:
-            loop.close()
+            loop.close()
+
+
+atexit.register(_close_loops)
+
+
+def generate_voiceover_sync(script_text: str, output_file: str = "voiceover.mp3") -> str:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # No loop running in this thread: reuse this thread's loop instead of building one per call.
+        return _thread_loop().run_until_complete(generate_voiceover(script_text, output_file))
+
+    # Blocking the running loop on its own future would deadlock, so run on a helper thread.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, generate_voiceover(script_text, output_file)).result()
@@ -1,6 +1,12 @@
 import os
+import socket
+import time
 from typing import Dict, Optional
 
+UPLOAD_CHUNK_BYTES = 8 * 1024 * 1024
+UPLOAD_MAX_RETRIES = 5
+RETRIABLE_STATUS_CODES = {500, 502, 503, 504}
+
 
 def upload_video_to_youtube(
     video_file: str,
@@ -14,6 +20,7 @@ def upload_video_to_youtube(
         from google.oauth2.credentials import Credentials
         from google_auth_oauthlib.flow import InstalledAppFlow
         from googleapiclient.discovery import build
+        from googleapiclient.errors import HttpError
         from googleapiclient.http import MediaFileUpload
     except Exception as exc:
         print(f"YouTube upload dependencies missing: {exc}")
@@ -53,12 +60,29 @@ def upload_video_to_youtube(
         },
     }
 
-    media = MediaFileUpload(video_file, chunksize=-1, resumable=True)
+    media = MediaFileUpload(video_file, chunksize=UPLOAD_CHUNK_BYTES, resumable=True)
     request = youtube.videos().insert(part="snippet,status", body=body, media_body=media)
 
     response = None
+    retries = 0
     while response is None:
-        _, response = request.next_chunk()
+        try:
+            status, response = request.next_chunk()
+        except HttpError as exc:
+            if exc.resp.status not in RETRIABLE_STATUS_CODES or retries >= UPLOAD_MAX_RETRIES:
+                raise
+            retries += 1
+            time.sleep(2**retries)
+            continue
+        except socket.timeout:
+            if retries >= UPLOAD_MAX_RETRIES:
+                raise
+            retries += 1
+            time.sleep(2**retries)
+            continue
+        retries = 0
+        if status:
+            print(f"Upload progress: {int(status.progress() * 100)}%")
 
     video_id = response.get("id")
     if not video_id: